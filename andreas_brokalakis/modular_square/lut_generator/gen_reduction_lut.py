@@ -19,8 +19,10 @@
 # limitations under the License.
 ################################################################################
 
+import os
 import sys
 import getopt
+from multiprocessing import Pool
 
 ################################################################################
 # Parameters to set
@@ -77,6 +79,7 @@ LOOK_UP_WIDTH         = WORD_LEN // 2
 LUT8_SIZE              = 2**LOOK_UP_WIDTH
 LUT9_SIZE             =  2**(LOOK_UP_WIDTH+1)		
 LUT_WIDTH             = WORD_LEN * NONREDUNDANT_ELEMENTS;
+LUT_DIGITS            = LUT_WIDTH // 4
 
 
 
@@ -84,54 +87,59 @@ LUT_WIDTH             = WORD_LEN * NONREDUNDANT_ELEMENTS;
 # Compute the reduction tables
 ################################################################################
 
-print ('Creating', LUT_NUM_ELEMENTS, 'files')
-print ('precompute_lut_{0:03d}.dat'.format(0))
-print ('         ...          ')
-print ('precompute_lut_{0:03d}.dat'.format(LUT_NUM_ELEMENTS-1))
-
-for i in range (LUT_NUM_ELEMENTS):
-   
-
+def reduction_table(t, size):
+   # t is already reduced, so each entry (t * j) % M is built up by repeated
+   # addition of t with a single conditional subtraction of M. Entries are
+   # formatted straight to bytes and joined once, and everything used in the
+   # loop is bound locally to keep the inner loop tight.
+   m = M
+   digits = LUT_DIGITS
+   lines = []
+   append = lines.append
+   cur = 0
+   for j in range (size):
+      append(b'%0*x\n' % (digits, cur))
+      cur += t
+      if cur >= m:
+         cur -= m
+   table = b''.join(lines)
+   return table
+
+
+def write_lut_file(filename, table, copies):
+   fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+   for k in range (copies):
+      data = memoryview(table)
+      while data:
+         data = data[os.write(fd, data):]
+   os.close(fd)
+
+
+def gen_reduction_luts(i):
    # Polynomial degree offset for V7V6
    offset = 8
 
    # Compute base reduction value for the coefficient degree
-   t_lut9 = (2**(((i + NONREDUNDANT_ELEMENTS) * WORD_LEN) + offset)) % M
-   t_lut8 = (2**((i + NONREDUNDANT_ELEMENTS) * WORD_LEN)) % M
+   t_lut9 = pow(2, ((i + NONREDUNDANT_ELEMENTS) * WORD_LEN) + offset, M)
+   t_lut8 = pow(2, (i + NONREDUNDANT_ELEMENTS) * WORD_LEN, M)
 
    # Each address represents a different value stored in the coefficient
-   Filename = list('precompute_lut8_{0:03d}.dat'.format(i))
-   f = open(''.join(Filename), 'w')
-   for j in range (LUT8_SIZE):
-      cur_lut8 = (t_lut8 * j) % M
-      f.write(hex(cur_lut8)[2:].zfill(LUT_WIDTH // 4))
-      f.write('\n')
-   #f.close()
-
-   i = i+1
-   for j in range (LUT8_SIZE):
-      cur_lut8 = (t_lut8 * j) % M
-      f.write(hex(cur_lut8)[2:].zfill(LUT_WIDTH // 4))
-      f.write('\n')
-   f.close() 
-
-   i = i-1  
-
-
-   Filename = list('precompute_lut9_{0:03d}.dat'.format(i))
-   f = open(''.join(Filename), 'w')
+   lut8 = reduction_table(t_lut8, LUT8_SIZE)
+   lut9 = reduction_table(t_lut9, LUT9_SIZE)
 
-   for j in range (LUT9_SIZE):
-      cur_lut9 = (t_lut9 * j) % M
-      f.write(hex(cur_lut9)[2:].zfill(LUT_WIDTH // 4))
-      f.write('\n')
-  
-   i = i+1
-   for j in range (LUT9_SIZE):
-      cur_lut9 = (t_lut9 * j) % M
-      f.write(hex(cur_lut9)[2:].zfill(LUT_WIDTH // 4))
-      f.write('\n')
+   # The ROMs hold twice as many entries (low and high values), so each
+   # table is computed once and written out twice. Files stay in hex for
+   # $readmemh.
+   write_lut_file('precompute_lut8_{0:03d}.dat'.format(i), lut8, 2)
+   write_lut_file('precompute_lut9_{0:03d}.dat'.format(i), lut9, 2)
 
-   f.close()
 
+if __name__ == '__main__':
+   print ('Creating', LUT_NUM_ELEMENTS, 'files')
+   print ('precompute_lut_{0:03d}.dat'.format(0))
+   print ('         ...          ')
+   print ('precompute_lut_{0:03d}.dat'.format(LUT_NUM_ELEMENTS-1))
 
+   # Every coefficient writes its own independent pair of files
+   with Pool() as p:
+      p.map(gen_reduction_luts, range (LUT_NUM_ELEMENTS))
@@ -2,6 +2,12 @@
 
 from random import getrandbits
 
+# Use GMP for the squaring loop when available
+try:
+	from gmpy2 import mpz
+except ImportError:
+	mpz = int
+
 # Competition is for 1024 bits
 NUM_BITS       = 1024
 
@@ -13,8 +19,14 @@ N = 1240666956841247413987989274048144327446984271257356841281318550649768953373
 
 
 # Dump all 2^i mod M values
+p = pow(2, 1020, N);
+pow2lines = [];
 for i in range(1020, 2048, 1):
-	print(i, " 0x", (hex(pow(2, i) % N))[2:].zfill(256), sep='')
+	pow2lines.append("%d 0x%s" % (i, format(p, '0256x')));
+	p = p << 1;
+	if (p >= N):
+		p -= N;
+print("\n".join(pow2lines));
 
 
 # t should be small for testing purposes.  
@@ -23,11 +35,13 @@ t = NUM_ITERATIONS
 
 # Iterative modular squaring t times
 # This is the function that needs to be optimized on FPGA
+x = mpz(x)
+n = mpz(N)
 for _ in range(t):
-   x = (x * x) % N
+   x = (x * x) % n
 
 # Final result is a 1024b value
-h = x
+h = int(x)
 print(h)
 
 
@@ -46,11 +60,19 @@ print("MODBITWIDTH = ", MODBITWIDTH);
 signsymbol = 1 << (LOGRADIX+1);
 print("signsymbol = ", hex(signsymbol));
 
+# pow2mod[k] = 2^k mod MODULUS for every bit position of the input
+MAXBIT = (2 << LOGNUMSYMBOLS) * (2+LOGRADIX);
+pow2mod = [0] * MAXBIT;
+p = 1 % MODULUS;
+for k in range(0, MAXBIT, 1):
+	pow2mod[k] = p;
+	p = p << 1;
+	if (p >= MODULUS):
+		p -= MODULUS;
+
 # generate mask for all sign bit positions
-ALLSIGNBITS = 0;
-for i in range(0, 2 << LOGNUMSYMBOLS, 1):
-	ALLSIGNBITS = (ALLSIGNBITS << LOGRADIX) + 2;
-ALLSIGNBITS = (ALLSIGNBITS << LOGRADIX);
+# (2 repeated every LOGRADIX bits, (2 << LOGNUMSYMBOLS) times, then shifted up by LOGRADIX)
+ALLSIGNBITS = (2 * (((1 << ((2 << LOGNUMSYMBOLS) * LOGRADIX)) - 1) // ((1 << LOGRADIX) - 1))) << LOGRADIX;
 print("ALLSIGNBITS = ", hex(ALLSIGNBITS));
 
 print("MODULUS = ", hex(MODULUS));
@@ -63,23 +85,25 @@ print("adderterms0 = ", hex(adderterms0));
 
 adderterms1 = 0;
 
-adderterms2 = 0;
-for i in range(1, 1 << LOGNUMSYMBOLS, 1):
-	adderterms2 = (adderterms2 << LOGRADIX) + signsymbol;
+# signsymbol repeated every LOGRADIX bits, ((1 << LOGNUMSYMBOLS) - 1) times
+adderterms2 = signsymbol * (((1 << (((1 << LOGNUMSYMBOLS) - 1) * LOGRADIX)) - 1) // ((1 << LOGRADIX) - 1));
 print("adderterms2 = ", hex(adderterms2));
 
 adderterms = adderterms0 + adderterms1 + adderterms2;
 
-for i in range(3, 250, 1):
-	iter = (i-3)*6 + (2+LOGRADIX)*(1 << LOGNUMSYMBOLS) - 2;
+# Adderterms whose first input is past the last symbol (bit MAXBIT) are empty
+iter0 = (2+LOGRADIX)*(1 << LOGNUMSYMBOLS) - 2;
+for i in range(3, min(250, 3 + (MAXBIT - iter0 + 5) // 6), 1):
+	iter = (i-3)*6 + iter0;
 	for j in range(0, 6, 1):
 		SYM = (iter+j)//(2+LOGRADIX);
 		BIT = (iter+j)%(2+LOGRADIX);
-		if (SYM < (2 << LOGNUMSYMBOLS)):
-			if (BIT == (1+LOGRADIX)):
-				MOD = (1 << ((SYM * LOGRADIX) + BIT)) % MODULUS;
-				print("i:", i, " SYM=", SYM, " BIT=", BIT, " MOD=", hex(MOD));
-				adderterms += MOD;
+		if (SYM >= (2 << LOGNUMSYMBOLS)):
+			break;		# SYM only grows with j
+		if (BIT == (1+LOGRADIX)):
+			MOD = pow2mod[(SYM * LOGRADIX) + BIT];
+			print("i:", i, " SYM=", SYM, " BIT=", BIT, " MOD=", hex(MOD));
+			adderterms += MOD;
 				
 				
 print("adderterms = ", hex(adderterms));
@@ -102,101 +126,13 @@ print("MODULUS[1023:0]=", hex(MODULUS & ((1 << 1024)-1)));
 
 
 def bigmodR(_x, m, _twopowerimodm):
-	term = 0;
-	x = _x;
-	twopowerimodm = _twopowerimodm;
-	while (x != 0):
-		if (x & 1):
-			term = term + twopowerimodm;
-			if (term >= m):
-				term = term - m;
-		x = x >> 1;
-		twopowerimodm = twopowerimodm << 1;
-		if (twopowerimodm >= m):
-			twopowerimodm = twopowerimodm - m;
-	return term;
+	# Accumulating (2^i * _twopowerimodm) mod m over every set bit i of _x,
+	# as bigmod does in hardware, reduces to a single multiply and modulo
+	return (_x * _twopowerimodm) % m;
 	
 
 print("dbgTERM2'= ", hex(bigmodR(dbgTERM2, MODULUS, 1)));
 
 
 
-if False: '''
-// Place holder
-genvar i;
-generate
-	// The first adderterm is the constant correction needed for all the negative symbols
-    assign adderterms[0] = bigmod({ MODULUS, (ALLSIGNBITS ^ ALLSIGNBITS) } - ALLSIGNBITS, MODULUS);
-
-	// The second adderterm is for all the symbols below the modulo-bitwidth (excluding the upper 2 bits per symbol)
-	for (i = 0; i < (1 << LOGNUMSYMBOLS); i = i + 1) begin : secondterm
-		assign adderterms[1][i * LOGRADIX +: LOGRADIX] = data_in[i][LOGRADIX-1:0];
-	end
-
-	// The third adderterm is for all the upper bits of each symbol below the modulo-bitwidth
-	assign adderterms[2][0 +: LOGRADIX] = 0;
-	for (i = 1; i < (1 << LOGNUMSYMBOLS); i = i + 1) begin : thirdterm
-		assign adderterms[2][i * LOGRADIX +: LOGRADIX] = (data_in[i-1] ^ signsymbol) >> LOGRADIX;
-	end
-
-	// The remaining adderterms are for all the bits above the modulo-bitwidth
-	for (i = 3; i < 200; i = i + 1) begin : modulolutterm
-		
-		localparam iter = (i-3)*6 + (2+LOGRADIX)*(1 << LOGNUMSYMBOLS) - 2;
-		
-		localparam SYM0 = (iter+0)/(2+LOGRADIX);
-		localparam BIT0 = (iter+0)%(2+LOGRADIX);
-		if (SYM0 < (2 << LOGNUMSYMBOLS)) begin
-		
-			localparam SYM1 = (iter+1)/(2+LOGRADIX);
-			localparam BIT1 = (iter+1)%(2+LOGRADIX);
-			localparam SYM2 = (iter+2)/(2+LOGRADIX);
-			localparam BIT2 = (iter+2)%(2+LOGRADIX);
-			localparam SYM3 = (iter+3)/(2+LOGRADIX);
-			localparam BIT3 = (iter+3)%(2+LOGRADIX);
-			localparam SYM4 = (iter+4)/(2+LOGRADIX);
-			localparam BIT4 = (iter+4)%(2+LOGRADIX);
-			localparam SYM5 = (iter+5)/(2+LOGRADIX);
-			localparam BIT5 = (iter+5)%(2+LOGRADIX);
-		
-			logic x0, x1, x2, x3, x4, x5;
-			
-			assign x0 = (SYM0 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM0] ^ signsymbol) : 0) >> BIT0;
-			assign x1 = (SYM1 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM1] ^ signsymbol) : 0) >> BIT1;
-			assign x2 = (SYM2 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM2] ^ signsymbol) : 0) >> BIT2;
-			assign x3 = (SYM3 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM3] ^ signsymbol) : 0) >> BIT3;
-			assign x4 = (SYM4 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM4] ^ signsymbol) : 0) >> BIT4;
-			assign x5 = (SYM5 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM5] ^ signsymbol) : 0) >> BIT5;
-			
-			localparam MOD0 = bigmod(4096'h1 << ((SYM0 * LOGRADIX) + BIT0), MODULUS);
-			localparam MOD1 = bigmod(4096'h1 << ((SYM1 * LOGRADIX) + BIT1), MODULUS);
-			localparam MOD2 = bigmod(4096'h1 << ((SYM2 * LOGRADIX) + BIT2), MODULUS);
-			localparam MOD3 = bigmod(4096'h1 << ((SYM3 * LOGRADIX) + BIT3), MODULUS);
-			localparam MOD4 = bigmod(4096'h1 << ((SYM4 * LOGRADIX) + BIT4), MODULUS);
-			localparam MOD5 = bigmod(4096'h1 << ((SYM5 * LOGRADIX) + BIT5), MODULUS);
-			
-			modulolut6 #(
-				.MODULUS		(MODULUS),
-				.MODBITWIDTH	(MODBITWIDTH),
-				.MOD0			(MOD0),
-				.MOD1			(MOD1),
-				.MOD2			(MOD2),
-				.MOD3			(MOD3),
-				.MOD4			(MOD4),
-				.MOD5			(MOD5)
-			) i_modulolut6 (
-				.x0_in			(x0),
-				.x1_in			(x1),
-				.x2_in			(x2),
-				.x3_in			(x3),
-				.x4_in			(x4),	
-				.x5_in			(x5),	
-				.value_out		(adderterms[i])
-			);
-			
-		end else begin
-		
-			assign adderterms[i] = 0;
-		
-		end
-'''
+# See placeholder in vdf_metzgen_placeholder.sv.txt
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 from random import getrandbits
+from itertools import compress
 
 
 N = 124066695684124741398798927404814432744698427125735684128131855064976895337309138910015071214657674309443149407457493434579063840841220334555160125016331040933690674569571217337630239191517205721310197608387239846364360850220896772964978569683229449266819903414117058030106528073928633017118689826625594484331
@@ -32,14 +33,24 @@ print("MODBITWIDTH = ", MODBITWIDTH);
 print("x = ", hex(x));
 
 
+# pow2mod[k] = 2^k mod MODULUS for every bit position of the input
+MAXBIT = (2 << LOGNUMSYMBOLS) * (2+LOGRADIX);
+pow2mod = [0] * MAXBIT;
+p = 1 % MODULUS;
+for k in range(0, MAXBIT, 1):
+	pow2mod[k] = p;
+	p = p << 1;
+	if (p >= MODULUS):
+		p -= MODULUS;
+
+
 # signsymbol has a single '1' in the bit location of the sign-bit
 signsymbol = 1 << (LOGRADIX+1);
 #print("signsymbol = ", hex(signsymbol));
 
 # generate mask for all sign bit positions
-ALLSIGNBITS = 0;
-for i in range(0, 2 << LOGNUMSYMBOLS, 1):
-	ALLSIGNBITS = (ALLSIGNBITS << LOGRADIX) + signsymbol;
+# (signsymbol repeated every LOGRADIX bits, (2 << LOGNUMSYMBOLS) times)
+ALLSIGNBITS = signsymbol * (((1 << ((2 << LOGNUMSYMBOLS) * LOGRADIX)) - 1) // ((1 << LOGRADIX) - 1));
 print("ALLSIGNBITS = ", hex(ALLSIGNBITS));
 
 
@@ -50,27 +61,39 @@ print("adderterms0 = ", hex(adderterms0));
 
 adderterms1 = 0;
 
-adderterms2 = 0;
-for i in range(1, 1 << LOGNUMSYMBOLS, 1):
-	adderterms2 = (adderterms2 << LOGRADIX) + signsymbol;
+# signsymbol repeated every LOGRADIX bits, ((1 << LOGNUMSYMBOLS) - 1) times
+adderterms2 = signsymbol * (((1 << (((1 << LOGNUMSYMBOLS) - 1) * LOGRADIX)) - 1) // ((1 << LOGRADIX) - 1));
 print("adderterms2 = ", hex(adderterms2));
 
 sumofadderterms = adderterms0 + adderterms1 + adderterms2;
 
+# LUT inputs for each adderterm, independent of x:
+#   bit positions in x, 2^k mod MODULUS
+schedule = [];
 for i in range(3, 250, 1):
 	iter = (i-3)*6 + (2+LOGRADIX)*(1 << LOGNUMSYMBOLS) - 2;
-	term = 0;
+	bitpos = [];
+	mods = [];
 	for j in range(0, 6, 1):
-		SYM = (iter+j)//(2+LOGRADIX);
-		BIT = (iter+j)%(2+LOGRADIX);
+		SYM, BIT = divmod(iter+j, 2+LOGRADIX);
 		if (SYM < (2 << LOGNUMSYMBOLS)):
-			MOD = (1 << ((SYM * LOGRADIX) + BIT)) % MODULUS;
-			x_iter = (x >> (iter+j)) & 1;
-			if (BIT == (1+LOGRADIX)):
-				x_iter = 1 - x_iter;		# flip sign bit
-			#print("i:", i, " iter:", iter + j, " SYM=", SYM, " BIT=", BIT, " x[iter]=", x_iter, " MOD=", hex(MOD));
-			if (x_iter):
-				term += MOD;
+			MOD = pow2mod[(SYM * LOGRADIX) + BIT];
+			#print("i:", i, " iter:", iter + j, " SYM=", SYM, " BIT=", BIT, " MOD=", hex(MOD));
+			bitpos.append(iter+j);
+			mods.append(MOD);
+	schedule.append((i, tuple(bitpos), tuple(mods)));
+
+# Flip the sign bit of every symbol of x up front, as the hardware does with
+# (data_in[SYM] ^ signsymbol), so the LUT selectors need no per-bit fixup
+XSIGNBITS = signsymbol * (((1 << MAXBIT) - 1) // ((1 << (2+LOGRADIX)) - 1));
+
+# xbits[k] is bit k of the flipped x, unpacked from its bytes rather than by shifting
+xbytes = ((x ^ XSIGNBITS) & ((1 << MAXBIT) - 1)).to_bytes((MAXBIT + 7) // 8, 'little');
+xbits = [(xbytes[k >> 3] >> (k & 7)) & 1 for k in range(0, MAXBIT, 1)];
+
+for i, bitpos, mods in schedule:
+	# Masked sum of the LUT values, selected by the (sign-flipped) bits of x
+	term = sum(compress(mods, map(xbits.__getitem__, bitpos)));
 	sumofadderterms += term;
 	print("adderterm[", i, "] = ", hex(term));
 				
@@ -78,82 +101,4 @@ for i in range(3, 250, 1):
 print("sumofadderterms % MODULUS = ", hex(sumofadderterms % MODULUS));
 
 
-if False: '''
-// Place holder
-genvar i;
-generate
-	// The first adderterm is the constant correction needed for all the negative symbols
-    assign adderterms[0] = bigmod({ MODULUS, (ALLSIGNBITS ^ ALLSIGNBITS) } - ALLSIGNBITS, MODULUS);
-
-	// The second adderterm is for all the symbols below the modulo-bitwidth (excluding the upper 2 bits per symbol)
-	for (i = 0; i < (1 << LOGNUMSYMBOLS); i = i + 1) begin : secondterm
-		assign adderterms[1][i * LOGRADIX +: LOGRADIX] = data_in[i][LOGRADIX-1:0];
-	end
-
-	// The third adderterm is for all the upper bits of each symbol below the modulo-bitwidth
-	assign adderterms[2][0 +: LOGRADIX] = 0;
-	for (i = 1; i < (1 << LOGNUMSYMBOLS); i = i + 1) begin : thirdterm
-		assign adderterms[2][i * LOGRADIX +: LOGRADIX] = (data_in[i-1] ^ signsymbol) >> LOGRADIX;
-	end
-
-	// The remaining adderterms are for all the bits above the modulo-bitwidth
-	for (i = 3; i < 200; i = i + 1) begin : modulolutterm
-		
-		localparam iter = (i-3)*6 + (2+LOGRADIX)*(1 << LOGNUMSYMBOLS) - 2;
-		
-		localparam SYM0 = (iter+0)/(2+LOGRADIX);
-		localparam BIT0 = (iter+0)%(2+LOGRADIX);
-		if (SYM0 < (2 << LOGNUMSYMBOLS)) begin
-		
-			localparam SYM1 = (iter+1)/(2+LOGRADIX);
-			localparam BIT1 = (iter+1)%(2+LOGRADIX);
-			localparam SYM2 = (iter+2)/(2+LOGRADIX);
-			localparam BIT2 = (iter+2)%(2+LOGRADIX);
-			localparam SYM3 = (iter+3)/(2+LOGRADIX);
-			localparam BIT3 = (iter+3)%(2+LOGRADIX);
-			localparam SYM4 = (iter+4)/(2+LOGRADIX);
-			localparam BIT4 = (iter+4)%(2+LOGRADIX);
-			localparam SYM5 = (iter+5)/(2+LOGRADIX);
-			localparam BIT5 = (iter+5)%(2+LOGRADIX);
-		
-			logic x0, x1, x2, x3, x4, x5;
-			
-			assign x0 = (SYM0 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM0] ^ signsymbol) : 0) >> BIT0;
-			assign x1 = (SYM1 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM1] ^ signsymbol) : 0) >> BIT1;
-			assign x2 = (SYM2 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM2] ^ signsymbol) : 0) >> BIT2;
-			assign x3 = (SYM3 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM3] ^ signsymbol) : 0) >> BIT3;
-			assign x4 = (SYM4 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM4] ^ signsymbol) : 0) >> BIT4;
-			assign x5 = (SYM5 < (2 << LOGNUMSYMBOLS) ? (data_in[SYM5] ^ signsymbol) : 0) >> BIT5;
-			
-			localparam MOD0 = bigmod(4096'h1 << ((SYM0 * LOGRADIX) + BIT0), MODULUS);
-			localparam MOD1 = bigmod(4096'h1 << ((SYM1 * LOGRADIX) + BIT1), MODULUS);
-			localparam MOD2 = bigmod(4096'h1 << ((SYM2 * LOGRADIX) + BIT2), MODULUS);
-			localparam MOD3 = bigmod(4096'h1 << ((SYM3 * LOGRADIX) + BIT3), MODULUS);
-			localparam MOD4 = bigmod(4096'h1 << ((SYM4 * LOGRADIX) + BIT4), MODULUS);
-			localparam MOD5 = bigmod(4096'h1 << ((SYM5 * LOGRADIX) + BIT5), MODULUS);
-			
-			modulolut6 #(
-				.MODULUS		(MODULUS),
-				.MODBITWIDTH	(MODBITWIDTH),
-				.MOD0			(MOD0),
-				.MOD1			(MOD1),
-				.MOD2			(MOD2),
-				.MOD3			(MOD3),
-				.MOD4			(MOD4),
-				.MOD5			(MOD5)
-			) i_modulolut6 (
-				.x0_in			(x0),
-				.x1_in			(x1),
-				.x2_in			(x2),
-				.x3_in			(x3),
-				.x4_in			(x4),	
-				.x5_in			(x5),	
-				.value_out		(adderterms[i])
-			);
-			
-		end else begin
-		
-			assign adderterms[i] = 0;
-		
-		end
-'''
+# See placeholder in vdf_metzgen_placeholder.sv.txt